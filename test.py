@@ -23,26 +23,259 @@ Usage:
 Notes:
  - Run this inside a git working tree (has .git).
  - If origin remote is missing or commands fail, script raises a helpful error.
+ - GitHub API responses are cached (with their ETag) under ~/.cache/get_git_github_values;
+   re-runs send conditional requests, and a 304 doesn't count against the rate limit.
+ - The final result is cached there too, per HEAD SHA, for 10 minutes; pass --no-cache to bypass it.
 """
 
 import os
 import re
+import shlex
+import shutil
+import hashlib
+import importlib.util
+import functools
 import subprocess
+import sys
 import json
-import argparse
-from typing import Optional, Tuple
-import requests
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
-GITHUB_API_BASE = "https://api.github.com"
+if TYPE_CHECKING:  # http.client is imported lazily at runtime; this only resolves the annotations
+    import http.client
+
+try:  # optional: faster JSON encoder for the result
+    import orjson
 
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode()  # same bytes as orjson: raw UTF-8
 
+GITHUB_API_BASE = "https://api.github.com"
+GITHUB_GRAPHQL_URL = GITHUB_API_BASE + "/graphql"
+# (connect, read) seconds for every GitHub request; retries below are bounded too
+HTTP_TIMEOUT = (3.05, 10)
+HTTP_RETRIES = 3  # total retries per request
+HTTP_CONNECT_RETRIES = 2  # of which failed connects (safe to repeat for any method)
+HTTP_READ_RETRIES = 2  # of which failures after the request was sent (GET only; a POST is never replayed)
+HTTP_BACKOFF = 0.5
+HTTP_MAX_RETRY_AFTER = 10  # longest server-requested Retry-After we'll sleep for, seconds
+HTTP_RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+HTTP_MAX_REDIRECTS = 3
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "get_git_github_values"
+# seconds a main() result stays valid for a given HEAD (default branch / base SHA can move upstream)
+RESULT_CACHE_TTL = 600
+
+_DEFAULT_HEADERS = {"Accept": "application/vnd.github+json", "User-Agent": "get-git-github-values-script/1.0"}
+# idle keep-alive connections to api.github.com, reused across calls (and threads) to skip TCP/TLS handshakes
+_CONN_POOL: "queue.LifoQueue[http.client.HTTPSConnection]" = queue.LifoQueue(maxsize=8)
+
+_REMOTE_RE = re.compile(r"[:/](?P<owner>[^/]+)/(?P<repo>[^/]+)$")
+
+# default branch name and its tip SHA in one round-trip
+REPO_META_QUERY = "query($o:String!,$r:String!){repository(owner:$o,name:$r){defaultBranchRef{name target{oid}}}}"
+
+# independent, read-only git lookups issued concurrently at the start of main()
+GIT_LOOKUPS: List[Tuple[str, Tuple[str, ...]]] = [
+    ("remote_url", ("remote", "get-url", "origin")),
+    ("local_user", ("config", "user.name")),
+    ("last_author", ("log", "-1", "--pretty=format:%an%x1f%ae%x1f%H")),
+    ("head", ("rev-parse", "HEAD", "--abbrev-ref", "HEAD")),
+    ("origin_head", ("rev-parse", "origin/HEAD", "--symbolic-full-name", "origin/HEAD")),
+    ("git_dir", ("rev-parse", "--git-dir")),
+]
+
+
+# git calls here only read (bar a one-off `remote set-head`): skip optional index/config locks (slow on
+# NFS / under antivirus), never block on a credential prompt, and use the C locale for git's own messages
+_GIT_ENV_OVERRIDES = {"GIT_OPTIONAL_LOCKS": "0", "GIT_TERMINAL_PROMPT": "0", "LC_ALL": "C"}
+
+
+def _git_env() -> Dict[str, str]:
+    return {**os.environ, **_GIT_ENV_OVERRIDES}
+
+
+@functools.lru_cache(maxsize=128)
 def run_git(*args: str, cwd: Optional[str] = None) -> str:
-    """Run git command and return stdout (stripped). Raises RuntimeError on failure."""
+    """
+    Run git command and return stdout (stripped). Raises RuntimeError on failure.
+    Successful results are memoized per (args, cwd); call clear_git_cache() after changing repo state.
+    """
+    r = subprocess.run(("git",) + args, capture_output=True, text=True, encoding="utf-8", cwd=cwd, env=_git_env())
+    if r.returncode:
+        raise RuntimeError(f"git {shlex.join(args)} failed: {r.stderr.strip()}")
+    return r.stdout.strip()
+
+
+def clear_git_cache() -> None:
+    """Drop memoized run_git results and parsed packed-refs (e.g. after a commit, checkout or chdir into another repo)."""
+    run_git.cache_clear()
+    _PACKED_REFS.clear()
+
+
+# git_dir -> {refname: sha}, loaded on first use by _resolve_ref
+_PACKED_REFS: Dict[str, Dict[str, str]] = {}
+
+
+def _load_packed_refs(refs_dir: str) -> Dict[str, str]:
+    refs: Dict[str, str] = {}
+    try:
+        with open(os.path.join(refs_dir, "packed-refs"), encoding="utf-8") as f:
+            for line in f:
+                # skip the "# pack-refs with:" header and "^<sha>" peeled-tag lines
+                if line.startswith(("#", "^")):
+                    continue
+                sha, _, name = line.strip().partition(" ")
+                if name:
+                    refs[name] = sha
+    except OSError:
+        pass
+    return refs
+
+
+def _resolve_ref(git_dir: Optional[str], refname: str) -> str:
+    """
+    Resolve a full refname (e.g. refs/remotes/origin/main) straight from the ref files on disk: the loose
+    ref file if present, else packed-refs (parsed once per git dir). Raises KeyError if neither has it.
+    """
+    if not git_dir:
+        raise KeyError(refname)
+    # linked worktrees keep shared refs in the common dir named by the "commondir" file
+    refs_dir = git_dir
+    try:
+        with open(os.path.join(git_dir, "commondir"), encoding="utf-8") as f:
+            refs_dir = os.path.join(git_dir, f.read().strip())
+    except OSError:
+        pass
+    try:
+        with open(os.path.join(refs_dir, refname), encoding="utf-8") as f:
+            value = f.read().strip()
+        if value.startswith("ref: "):
+            return _resolve_ref(git_dir, value[5:])
+        return value
+    except OSError:
+        pass
+    if refs_dir not in _PACKED_REFS:
+        _PACKED_REFS[refs_dir] = _load_packed_refs(refs_dir)
+    return _PACKED_REFS[refs_dir][refname]
+
+
+def run_git_batch_revparse(*refs: str, cwd: Optional[str] = None) -> List[str]:
+    """
+    Resolve several refs with a single `git rev-parse` process (one output line per ref).
+    Options such as --abbrev-ref apply to the refs that follow them, e.g.
+    run_git_batch_revparse("HEAD", "--abbrev-ref", "HEAD") -> [<sha>, <branch>].
+    Raises RuntimeError if any ref fails to resolve.
+    """
+    return run_git("rev-parse", *refs, cwd=cwd).splitlines()
+
+
+class GitBatchCheck:
+    """
+    Persistent `git cat-file --batch-check` process: resolves any number of refs to SHAs over one pipe,
+    paying git's fork/exec/startup cost once. Use as a context manager so the process is always closed.
+    """
+
+    def __init__(self, cwd: Optional[str] = None):
+        self._proc = subprocess.Popen(
+            ("git", "cat-file", "--batch-check=%(objectname)"),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=cwd,
+            env=_git_env(),
+            text=True,
+        )
+
+    def resolve(self, ref: str) -> Optional[str]:
+        """Return the SHA `ref` points to, or None if it doesn't resolve. Raises RuntimeError if git died."""
+        try:
+            self._proc.stdin.write(ref + "\n")
+            self._proc.stdin.flush()
+            line = self._proc.stdout.readline()
+        except OSError as e:
+            raise RuntimeError(f"git cat-file --batch-check failed: {e}")
+        if not line:
+            raise RuntimeError("git cat-file --batch-check exited unexpectedly")
+        line = line.strip()
+        # unresolvable input is echoed back as "<ref> missing" / "<ref> ambiguous"
+        return None if " " in line else line
+
+    def close(self) -> None:
+        if self._proc.stdin:
+            self._proc.stdin.close()
+        self._proc.wait()
+
+    def __enter__(self) -> "GitBatchCheck":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def run_git_many(refs: List[str], cwd: Optional[str] = None) -> List[Optional[str]]:
+    """Resolve several refs with a single git process. Unlike run_git_batch_revparse, missing refs give None."""
+    with GitBatchCheck(cwd=cwd) as batch:
+        return [batch.resolve(ref) for ref in refs]
+
+
+class NoGitRepositoryError(RuntimeError):
+    """No git repository contains the given path."""
+
+
+def read_git_lookups_pygit2(path: str = ".") -> Dict[str, Optional[str]]:
+    """
+    Answer the GIT_LOOKUPS queries in-process with pygit2 (no subprocesses), for hosts without a git binary.
+    Values use the same text format as the corresponding git command's output; a value is None where git
+    would have failed.
+    Raises NoGitRepositoryError if no repository contains `path`; other errors (bare repos, repository
+    features libgit2 doesn't support, ...) mean the caller should ask git itself instead.
+    """
+    import pygit2  # imported here: loading libgit2 costs ~50 ms, more than the git lookups it replaces
+
+    git_dir = pygit2.discover_repository(path)
+    if git_dir is None:
+        raise NoGitRepositoryError(f"no git repository found at {os.path.abspath(path)}")
+    repo = pygit2.Repository(git_dir)
+    if repo.is_bare:
+        raise RuntimeError(f"{git_dir} is a bare repository")
+
+    values: Dict[str, Optional[str]] = {key: None for key, _ in GIT_LOOKUPS}
+    values["git_dir"] = repo.path
+    try:
+        values["remote_url"] = repo.remotes["origin"].url
+    except KeyError:
+        pass
     try:
-        out = subprocess.check_output(("git",) + args, stderr=subprocess.STDOUT, cwd=cwd)
-        return out.decode().strip()
-    except subprocess.CalledProcessError as e:
-        raise RuntimeError(f"git {' '.join(args)} failed: {e.output.decode().strip()}")
+        values["local_user"] = repo.config["user.name"]
+    except KeyError:
+        pass
+    if not repo.head_is_unborn:
+        head = repo.head
+        commit = repo[head.target]
+        head_branch = "HEAD" if repo.head_is_detached else head.shorthand
+        values["last_author"] = f"{commit.author.name}\x1f{commit.author.email}\x1f{head.target}"
+        values["head"] = f"{head.target}\n{head_branch}"
+    origin_head = repo.references.get("refs/remotes/origin/HEAD")
+    if origin_head is not None:
+        try:
+            target = origin_head.resolve()
+            values["origin_head"] = f"{target.target}\n{target.name}"
+        except (KeyError, pygit2.GitError):
+            pass
+    return values
+
+
+def _result_or_none(future) -> Optional[str]:
+    try:
+        return future.result()
+    except Exception:
+        return None
 
 
 def parse_remote_owner_repo(remote_url: str) -> Tuple[str, str]:
@@ -52,196 +285,594 @@ def parse_remote_owner_repo(remote_url: str) -> Tuple[str, str]:
       - https://github.com/owner/repo.git
       - ssh://git@github.com/owner/repo.git
     """
-    s = remote_url.strip()
     # strip trailing .git if present
-    if s.endswith(".git"):
-        s = s[:-4]
+    s = remote_url.strip().removesuffix(".git")
 
-    # SSH style git@github.com:owner/repo
-    m = re.search(r"[:/](?P<owner>[^/]+)/(?P<repo>[^/]+)$", s)
+    # fast path: repo is after the last "/", owner after the "/" or ":" before it
+    head, sep, repo = s.rpartition("/")
+    if sep and repo:
+        owner_start = max(head.rfind("/"), head.rfind(":")) + 1
+        if owner_start and head[owner_start:]:
+            return head[owner_start:], repo
+
+    # last resort for anything the string split didn't handle
+    m = _REMOTE_RE.search(s)
     if m:
         return m.group("owner"), m.group("repo")
 
     raise ValueError(f"Cannot parse owner/repo from remote URL: {remote_url}")
 
 
-def github_api_get(path: str, token: Optional[str]) -> dict:
-    url = GITHUB_API_BASE.rstrip("/") + path
-    headers = {"Accept": "application/vnd.github+json", "User-Agent": "get-git-github-values-script/1.0"}
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
-    r = requests.get(url, headers=headers, timeout=15)
-    r.raise_for_status()
-    return r.json()
+class GitHubAPIError(Exception):
+    """A GitHub request failed: `status` is the HTTP status, or None if no response was received."""
 
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
 
-def try_map_email_to_login(email: str, token: Optional[str]) -> Optional[str]:
+
+@functools.lru_cache(maxsize=None)
+def _ssl_context():
     """
-    Best-effort mapping from commit author email -> GitHub login using the Search Commits API.
-    This endpoint requires a special Accept header (cloak-preview). It may not always return a mapping.
-    If token omitted or search fails, returns None.
+    TLS context for api.github.com, created on first use (loading the CA store is slow). Uses certifi's CA
+    bundle when installed, as requests did (python.org macOS builds have no usable system store).
     """
-    if not token:
-        return None
-    # Search commits by author-email (requires 'application/vnd.github.cloak-preview' accept)
-    q = f"author-email:{email}"
-    url = f"{GITHUB_API_BASE}/search/commits?q={requests.utils.requote_uri(q)}"
-    headers = {
-        "Accept": "application/vnd.github.cloak-preview",
-        "Authorization": f"Bearer {token}",
-        "User-Agent": "get-git-github-values-script/1.0",
-    }
+    import ssl
+
     try:
-        r = requests.get(url, headers=headers, timeout=15)
-        r.raise_for_status()
-        data = r.json()
-        items = data.get("items") or []
-        # items' structure: each item may contain 'author' dict with 'login'
-        for it in items:
-            author = it.get("author")
-            if author and author.get("login"):
-                return author.get("login")
-        return None
-    except Exception:
+        import certifi
+    except ImportError:
+        return ssl.create_default_context()
+    return ssl.create_default_context(cafile=certifi.where())
+
+
+def _https_proxy(host: str) -> Optional[Tuple[str, Optional[int], Dict[str, str]]]:
+    """
+    (proxy_host, proxy_port, tunnel_headers) for reaching `host`, from HTTPS_PROXY/NO_PROXY (or the platform
+    settings), the way requests picked them up; None to connect directly.
+    """
+    import base64
+    import urllib.parse
+    import urllib.request
+
+    proxy = urllib.request.getproxies().get("https")
+    if not proxy or urllib.request.proxy_bypass(host):
         return None
+    parts = urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+    headers = {}
+    if parts.username:
+        credentials = f"{urllib.parse.unquote(parts.username)}:{urllib.parse.unquote(parts.password or '')}"
+        headers["Proxy-Authorization"] = "Basic " + base64.b64encode(credentials.encode()).decode()
+    return parts.hostname, parts.port, headers
 
 
-def main(token: Optional[str] = None):
-    # 1) Ensure we're inside a git repo
+def _new_connection(host: str) -> "http.client.HTTPSConnection":
+    """A fresh (not yet connected) HTTPS connection to `host`, tunnelled through the HTTPS proxy if one applies."""
+    import http.client
+
+    proxy = _https_proxy(host)
+    if proxy is None:
+        return http.client.HTTPSConnection(host, timeout=HTTP_TIMEOUT[0], context=_ssl_context())
+    proxy_host, proxy_port, tunnel_headers = proxy
+    conn = http.client.HTTPSConnection(proxy_host, proxy_port, timeout=HTTP_TIMEOUT[0], context=_ssl_context())
+    conn.set_tunnel(host, headers=tunnel_headers)
+    return conn
+
+
+def _is_dropped(conn: "http.client.HTTPSConnection") -> bool:
+    """
+    Whether an idle pooled connection was closed by the server. Nothing is expected on an idle connection,
+    so a readable socket means EOF / close_notify (the check urllib3 does before reusing a connection).
+    """
+    import select
+
+    if conn.sock is None:
+        return False
     try:
-        run_git("rev-parse", "--is-inside-work-tree")
-    except Exception as e:
-        raise SystemExit(f"Not inside a git repository: {e}")
+        readable, _, _ = select.select([conn.sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+    return bool(readable)
+
 
-    # 2) remote origin url
+def _github_send(method: str, url: str, headers: dict, body: Optional[bytes] = None) -> Tuple[int, "http.client.HTTPMessage", bytes]:
+    """
+    Send one request to api.github.com over a pooled keep-alive connection and return (status, headers, body);
+    redirects are not followed here (see _github_request).
+    Failed connects are retried for any method; errors after the request was sent, and 429/5xx replies, are
+    retried for GET only, with exponential backoff within the HTTP_*_RETRIES budgets (a Retry-After longer
+    than HTTP_MAX_RETRY_AFTER isn't waited for). Raises GitHubAPIError if the request can't be completed.
+    """
+    # imported here so runs that never talk to GitHub don't pay for http.client / ssl at startup
+    import http.client
+    import ssl
+    import urllib.parse
+
+    # how sending on a connection the server already closed shows up (RemoteDisconnected is a
+    # ConnectionResetError; over TLS the close surfaces as an SSL EOF instead)
+    stale_connection_errors = (
+        ConnectionResetError,
+        ConnectionAbortedError,
+        BrokenPipeError,
+        ssl.SSLEOFError,
+        ssl.SSLZeroReturnError,
+    )
+
+    parts = urllib.parse.urlsplit(url)
+    target = parts.path + (f"?{parts.query}" if parts.query else "")
+    headers = {**_DEFAULT_HEADERS, **headers}
+    attempt = connect_failures = read_failures = 0
+    skip_pool = False
+    while True:
+        conn = None
+        while conn is None and not skip_pool:
+            try:
+                conn = _CONN_POOL.get_nowait()
+            except queue.Empty:
+                break
+            if _is_dropped(conn):
+                conn.close()
+                conn = None
+        reused = conn is not None
+        if conn is None:
+            conn = _new_connection(parts.netloc)
+        try:
+            if conn.sock is None:
+                conn.connect()
+                conn.sock.settimeout(HTTP_TIMEOUT[1])
+        except OSError as e:
+            conn.close()
+            connect_failures += 1
+            if attempt == HTTP_RETRIES or connect_failures > HTTP_CONNECT_RETRIES:
+                raise GitHubAPIError(f"{method} {url} failed to connect: {e}")
+            time.sleep(HTTP_BACKOFF * 2 ** attempt)
+            attempt += 1
+            continue
+        resp = None
+        try:
+            conn.request(method, target, body=body, headers=headers)
+            resp = conn.getresponse()
+            data = resp.read()
+        except (OSError, http.client.HTTPException) as e:
+            conn.close()
+            if reused and resp is None and isinstance(e, stale_connection_errors):
+                # the server closed this idle keep-alive connection after _is_dropped looked at it:
+                # nothing was processed, so resend at once on a new connection
+                skip_pool = True
+                continue
+            read_failures += 1
+            if method != "GET" or attempt == HTTP_RETRIES or read_failures > HTTP_READ_RETRIES:
+                raise GitHubAPIError(f"{method} {url} failed: {e}")
+            time.sleep(HTTP_BACKOFF * 2 ** attempt)
+            attempt += 1
+            continue
+
+        if resp.will_close:
+            conn.close()
+        else:
+            try:
+                _CONN_POOL.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+        if method == "GET" and resp.status in HTTP_RETRY_STATUSES and attempt < HTTP_RETRIES:
+            retry_after = resp.headers.get("Retry-After", "")
+            delay = float(retry_after) if retry_after.isdigit() else HTTP_BACKOFF * 2 ** attempt
+            # a server asking us to wait longer than the cap gets its error reply returned instead
+            if delay <= HTTP_MAX_RETRY_AFTER:
+                time.sleep(delay)
+                attempt += 1
+                continue
+        return resp.status, resp.headers, data
+
+
+def _github_request(method: str, url: str, headers: dict, body: Optional[bytes] = None) -> Tuple[int, "http.client.HTTPMessage", bytes]:
+    """
+    _github_send, following GitHub's redirects for renamed/transferred repos (301/302/307/308, GET only, at most
+    HTTP_MAX_REDIRECTS hops, and only to https on the same host). A redirect that isn't followed is returned as is.
+    """
+    import urllib.parse
+
+    origin = urllib.parse.urlsplit(url)
+    for _ in range(HTTP_MAX_REDIRECTS + 1):
+        status, resp_headers, data = _github_send(method, url, headers, body)
+        location = resp_headers.get("Location")
+        if method != "GET" or status not in (301, 302, 307, 308) or not location:
+            break
+        target = urllib.parse.urlsplit(urllib.parse.urljoin(url, location))
+        if target.scheme != "https" or target.netloc != origin.netloc:
+            break
+        url = target.geturl()
+    return status, resp_headers, data
+
+
+def _write_private(path: Path, data: bytes) -> None:
+    """Write a file under CACHE_DIR readable by the current user only (the cache holds private-repo metadata)."""
+    CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+    os.chmod(CACHE_DIR, 0o700)  # also tighten a directory left behind by an older version
+    path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+
+
+def cached_get(url: str, headers: dict) -> dict:
+    """
+    GET a GitHub API URL using a conditional request. The last (etag, body) pair is kept under CACHE_DIR;
+    repeat calls send If-None-Match and a 304 reply (free against the rate limit) returns the cached body.
+    """
+    key = hashlib.sha256(f"{url}\0{headers.get('Accept')}\0{headers.get('Authorization')}".encode()).hexdigest()
+    cache_path = CACHE_DIR / f"{key}.json"
+    cached = None
     try:
-        remote_url = run_git("remote", "get-url", "origin")
-    except Exception:
-        # fallback: list remotes and pick the first
-        remotes = run_git("remote").splitlines()
-        if not remotes:
-            raise SystemExit("No git remote found. Make sure 'origin' remote exists or add a remote.")
-        remote_name = remotes[0].strip()
-        remote_url = run_git("remote", "get-url", remote_name)
+        cached = json.loads(cache_path.read_text())
+        headers = {**headers, "If-None-Match": cached["etag"]}
+    except (OSError, ValueError, KeyError):
+        cached = None
+
+    status, resp_headers, data = _github_request("GET", url, headers)
+    if status == 304 and cached is not None:
+        return cached["body"]
+    if not 200 <= status < 300:
+        raise GitHubAPIError(f"GET {url} returned HTTP {status}", status)
+    body = json.loads(data)
+    etag = resp_headers.get("ETag")
+    if etag:
+        try:
+            _write_private(cache_path, json.dumps({"etag": etag, "body": body}).encode())
+        except OSError:
+            pass  # cache is best-effort
+    return body
+
+
+def github_api_get(path: str, token: Optional[str]) -> dict:
+    url = GITHUB_API_BASE.rstrip("/") + path
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    return cached_get(url, headers)
+
+
+def _graphql_post(token: str, query: str, variables: dict) -> dict:
+    """POST a GraphQL query and return the whole payload ('data' and any 'errors'). Raises GitHubAPIError on HTTP errors."""
+    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+    body = json.dumps({"query": query, "variables": variables}).encode()
+    status, _, data = _github_request("POST", GITHUB_GRAPHQL_URL, headers, body)
+    if not 200 <= status < 300:
+        raise GitHubAPIError(f"POST {GITHUB_GRAPHQL_URL} returned HTTP {status}", status)
+    return json.loads(data)
 
-    owner, repo = parse_remote_owner_repo(remote_url)
 
-    # 3) local configured user.name (may be empty)
-    local_user = ""
+def github_graphql(token: str, query: str, variables: dict) -> dict:
+    """POST a GraphQL query and return its 'data'. Raises GitHubAPIError on HTTP errors, RuntimeError on GraphQL errors."""
+    payload = _graphql_post(token, query, variables)
+    if payload.get("errors"):
+        raise RuntimeError(f"GraphQL query failed: {payload['errors'][0].get('message')}")
+    return payload.get("data") or {}
+
+
+def map_shas_to_logins(owner: str, repo: str, shas: List[str], token: Optional[str]) -> Dict[str, Optional[str]]:
+    """
+    Best-effort mapping from commit SHA -> GitHub login of the commit author, for any number of commits in one
+    GraphQL query (one aliased `object(oid:)` lookup per SHA). SHAs GitHub doesn't know (e.g. unpushed commits)
+    or whose author has no GitHub account map to None. If the query comes back with errors, the unresolved
+    SHAs are retried through REST /repos/{owner}/{repo}/commits/{sha}. Without a token, everything maps to None.
+    """
+    logins: Dict[str, Optional[str]] = {sha: None for sha in shas}
+    if not token or not shas:
+        return logins
+
+    params = "".join(f",$s{i}:GitObjectID!" for i in range(len(shas)))
+    lookups = "".join(f"c{i}:object(oid:$s{i}){{... on Commit{{author{{user{{login}}}}}}}}" for i in range(len(shas)))
+    query = f"query($o:String!,$r:String!{params}){{repository(owner:$o,name:$r){{{lookups}}}}}"
+    variables = {"o": owner, "r": repo, **{f"s{i}": sha for i, sha in enumerate(shas)}}
     try:
-        local_user = run_git("config", "user.name")
-    except Exception:
-        local_user = ""
+        payload = _graphql_post(token, query, variables)
+    except (GitHubAPIError, ValueError):
+        return logins
+
+    repository = (payload.get("data") or {}).get("repository") or {}
+    for i, sha in enumerate(shas):
+        commit = repository.get(f"c{i}") or {}
+        logins[sha] = ((commit.get("author") or {}).get("user") or {}).get("login")
+
+    if payload.get("errors"):
+        for sha in [sha for sha, login in logins.items() if login is None]:
+            try:
+                commit_data = github_api_get(f"/repos/{owner}/{repo}/commits/{sha}", token)
+                logins[sha] = (commit_data.get("author") or {}).get("login")
+            except (GitHubAPIError, ValueError):
+                pass
+    return logins
+
 
-    # 4) last commit author name and email
+def map_sha_to_login(owner: str, repo: str, sha: str, token: Optional[str]) -> Optional[str]:
+    """Best-effort GitHub login of the author of commit `sha` (see map_shas_to_logins). Returns None if unknown."""
+    return map_shas_to_logins(owner, repo, [sha], token)[sha]
+
+
+def fetch_default_branch(owner: str, repo: str, token: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Best-effort (default_branch, tip_sha) from GitHub: one GraphQL query, falling back to REST
+    /repos/{owner}/{repo} (no SHA) if GraphQL answers with a 4xx. Returns (None, None) on failure.
+    """
+    if not token:
+        return None, None
     try:
-        last_author_name = run_git("log", "-1", "--pretty=format:%an")
-        last_author_email = run_git("log", "-1", "--pretty=format:%ae")
+        data = github_graphql(token, REPO_META_QUERY, {"o": owner, "r": repo})
+        ref = (data.get("repository") or {}).get("defaultBranchRef") or {}
+        return ref.get("name"), (ref.get("target") or {}).get("oid")
+    except GitHubAPIError as e:
+        # GraphQL refused the request (e.g. token scopes): fall back to REST
+        if e.status is not None and 400 <= e.status < 500:
+            try:
+                return github_api_get(f"/repos/{owner}/{repo}", token).get("default_branch"), None
+            except Exception:
+                pass
+        return None, None
     except Exception:
-        last_author_name = ""
-        last_author_email = ""
+        return None, None
+
+
+def result_cache_path(owner: str, repo: str, head_sha: str, token: Optional[str]) -> Path:
+    """Where main() keeps its result for this commit; bucketed by a hash of the token, since results differ per token."""
+    bucket = hashlib.sha256(token.encode()).hexdigest()[:12] if token else "anon"
+    return CACHE_DIR / "results" / f"{owner}_{repo}_{head_sha}_{bucket}.json"
+
+
+def _write_stdout(data: bytes) -> None:
+    """Write `data` plus a newline to stdout, skipping the text layer when a binary buffer is available."""
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:  # e.g. stdout replaced by a StringIO
+        sys.stdout.write(data.decode() + "\n")
+        return
+    sys.stdout.flush()  # keep ordering with anything already printed
+    buffer.write(data)
+    buffer.write(b"\n")
+    buffer.flush()
+
 
-    # 5) head branch and head sha
+def _cached_base_is_current(cached: dict, git_dir: Optional[str], local_default_branch: Optional[str]) -> bool:
+    """
+    Whether a cached result's default_branch/base_ref/base_sha still match the local refs they came from:
+    refs/remotes/origin/* (and origin/HEAD) move on fetch without HEAD moving.
+    """
+    default_branch = cached.get("default_branch")
+    if local_default_branch and local_default_branch != default_branch:
+        return False
     try:
-        head_branch = run_git("rev-parse", "--abbrev-ref", "HEAD")
-    except Exception:
-        head_branch = "HEAD"  # detached
+        current = (f"origin/{default_branch}", _resolve_ref(git_dir, f"refs/remotes/origin/{default_branch}"))
+    except KeyError:
+        try:
+            current = (default_branch, _resolve_ref(git_dir, f"refs/heads/{default_branch}"))
+        except KeyError:
+            # no local ref: the cached base came from GitHub, if it was resolved at all
+            return cached.get("base_ref") == default_branch
+    return (cached.get("base_ref"), cached.get("base_sha")) == current
+
 
+def _prune_expired_results(results_dir: Path) -> None:
+    """Delete the result files in `results_dir` older than RESULT_CACHE_TTL."""
+    cutoff = time.time() - RESULT_CACHE_TTL
     try:
-        head_sha = run_git("rev-parse", "HEAD")
-    except Exception:
-        head_sha = ""
+        entries = list(os.scandir(results_dir))
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if entry.name.endswith(".json") and entry.stat().st_mtime < cutoff:
+                os.unlink(entry.path)
+        except OSError:
+            pass  # raced with another run, or not ours to delete
 
-    # 6) fetch remote refs lightly (try to ensure origin/<branch> exists)
-    # Not forcing full fetch; just try `git remote show origin` to see HEAD branch mapping
-    default_branch = None
-    base_sha = None
 
-    # First try to get default branch from GitHub API if token provided
-    if token:
+def load_cached_result(
+    cache_path: Path, current: dict, git_dir: Optional[str], local_default_branch: Optional[str] = None
+) -> Optional[bytes]:
+    """
+    Return the cached result JSON if it is younger than RESULT_CACHE_TTL, still agrees with the `current`
+    local values that can change without HEAD moving (branch name, user.name, remote URL), and its base
+    still matches the local refs (see _cached_base_is_current); else None. On a miss, expired result files
+    are deleted, since each one is keyed by a HEAD sha that may never be looked up again.
+    """
+    try:
+        if time.time() - cache_path.stat().st_mtime > RESULT_CACHE_TTL:
+            _prune_expired_results(cache_path.parent)
+            return None
+        data = cache_path.read_bytes()
+        cached = json.loads(data)
+    except FileNotFoundError:
+        _prune_expired_results(cache_path.parent)
+        return None
+    except (OSError, ValueError):
+        return None
+    if any(cached.get(k) != v for k, v in current.items()):
+        return None
+    if not _cached_base_is_current(cached, git_dir, local_default_branch):
+        return None
+    return data
+
+
+def main(token: Optional[str] = None, use_cache: bool = True):
+    # shared pool for the concurrent git lookups and GitHub API calls
+    with ThreadPoolExecutor(max_workers=len(GIT_LOOKUPS) + 3) as ex:
+        # 1) Ensure we're inside a git repo, and answer the independent lookups below
+        git_values = None
+        if shutil.which("git") is None and importlib.util.find_spec("pygit2") is not None:
+            try:
+                git_values = read_git_lookups_pygit2()
+            except NoGitRepositoryError as e:
+                raise SystemExit(f"Not inside a git repository: {e}")
+            except Exception:
+                git_values = None  # e.g. an extension libgit2 doesn't support: let git answer instead
+        if git_values is None:
+            # the repo check and the lookups don't depend on each other: start them all at once, then join
+            inside_future = ex.submit(run_git, "rev-parse", "--is-inside-work-tree")
+            git_futures = {key: ex.submit(run_git, *args) for key, args in GIT_LOOKUPS}
+            try:
+                inside_future.result()
+            except Exception as e:
+                raise SystemExit(f"Not inside a git repository: {e}")
+            git_values = {key: _result_or_none(f) for key, f in git_futures.items()}
+
+        # 2) remote origin url
+        remote_url = git_values["remote_url"]
+        if remote_url is None:
+            # fallback: list remotes and pick the first
+            remotes = run_git("remote").splitlines()
+            if not remotes:
+                raise SystemExit("No git remote found. Make sure 'origin' remote exists or add a remote.")
+            remote_name = remotes[0].strip()
+            remote_url = run_git("remote", "get-url", remote_name)
+
+        owner, repo = parse_remote_owner_repo(remote_url)
+
+        # 3) local configured user.name (may be empty)
+        local_user = git_values["local_user"] or ""
+
+        # 4) last commit author name and email (one `git log`, fields separated by \x1f)
         try:
-            repo_meta = github_api_get(f"/repos/{owner}/{repo}", token)
-            default_branch = repo_meta.get("default_branch")
+            last_author_name, last_author_email, _ = git_values["last_author"].split("\x1f")
         except Exception:
-            default_branch = None
+            last_author_name = ""
+            last_author_email = ""
 
-    # If no token or API failed, try to detect via origin/HEAD or remote show
-    if not default_branch:
+        # 5) head sha and head branch (one `git rev-parse` for both)
         try:
-            # symbolic-ref can work if origin/HEAD is set locally
-            out = run_git("symbolic-ref", "refs/remotes/origin/HEAD")
-            # refs/remotes/origin/<branch>
-            default_branch = out.rsplit("/", 1)[-1]
+            head_sha, head_branch = git_values["head"].splitlines()
         except Exception:
-            # fallback to parsing `git remote show origin`
+            head_sha = ""
+            head_branch = "HEAD"  # detached / no commits yet
+
+        # a recent run at this same commit already resolved everything else: reuse its result
+        cache_path = result_cache_path(owner, repo, head_sha, token) if use_cache and head_sha else None
+        if cache_path is not None:
+            # without a token the default branch comes from origin/HEAD, which can also move locally
+            local_default_branch = None
+            if not token and git_values["origin_head"]:
+                local_default_branch = git_values["origin_head"].splitlines()[-1].rsplit("/", 1)[-1]
+            cached = load_cached_result(
+                cache_path,
+                {"remote_url": remote_url, "local_user": local_user, "head_branch": head_branch},
+                git_values["git_dir"],
+                local_default_branch,
+            )
+            if cached is not None:
+                _write_stdout(cached)
+                return
+
+        # GitHub calls only need owner/repo and HEAD: start them now so their round-trips overlap
+        # the remaining local git work, and join them only where the result is used
+        repo_meta_future = ex.submit(fetch_default_branch, owner, repo, token) if token else None
+        mapped_future = None
+        if head_sha and token:
+            mapped_future = ex.submit(map_sha_to_login, owner, repo, head_sha, token)
+
+        # 6) fetch remote refs lightly (try to ensure origin/<branch> exists)
+        # Not forcing full fetch; origin/HEAD is queried from the remote at most once (see below)
+        default_branch = None
+        base_sha = None
+        origin_head_sha = None
+        remote_base_sha = None  # tip of the default branch on GitHub, from the GraphQL query
+
+        # First try to get default branch (and its SHA) from GitHub API if token provided
+        if repo_meta_future is not None:
+            default_branch, remote_base_sha = repo_meta_future.result()
+
+        # If no token or API failed, try to detect via origin/HEAD
+        if not default_branch:
             try:
-                info = run_git("remote", "show", "origin")
-                # look for "HEAD branch: <name>"
-                m = re.search(r"HEAD branch: (.+)", info)
-                if m:
-                    default_branch = m.group(1).strip()
+                # origin/HEAD is set locally: resolve its SHA and target ref in one call
+                origin_head_sha, out = git_values["origin_head"].splitlines()
+                # refs/remotes/origin/<branch>
+                default_branch = out.rsplit("/", 1)[-1]
             except Exception:
-                default_branch = None
-
-    # final fallback
-    if not default_branch:
-        default_branch = "main"  # common default; user can override if needed
-
-    # Attempt to compute base ref and base SHA
-    # Prefer origin/<default_branch> if available locally; else fallback to GitHub API if token
-    # First check if origin/<default_branch> exists locally and get its SHA
-    try:
-        base_sha = run_git("rev-parse", f"origin/{default_branch}")
-        base_ref = f"origin/{default_branch}"
-    except Exception:
-        # try local branch named default_branch
-        try:
-            base_sha = run_git("rev-parse", default_branch)
+                # fallback: ask the remote for its HEAD once and record it as origin/HEAD, so later
+                # runs resolve it locally instead of a network round-trip every time
+                # (unlike `git remote show origin`, which queries the remote on every call)
+                try:
+                    run_git("remote", "set-head", "origin", "--auto")
+                    origin_head_sha, out = run_git_batch_revparse("origin/HEAD", "--symbolic-full-name", "origin/HEAD")
+                    default_branch = out.rsplit("/", 1)[-1]
+                except Exception:
+                    origin_head_sha = None
+                    default_branch = None
+
+        # final fallback
+        if not default_branch:
+            default_branch = "main"  # common default; user can override if needed
+
+        # Attempt to compute base ref and base SHA
+        # Prefer origin/<default_branch> if available locally; else fallback to GitHub API if token
+        # origin/HEAD already resolved to origin/<default_branch> above; otherwise read the ref from
+        # .git directly, and only if it isn't on disk look up origin/<default_branch> and the local
+        # <default_branch> through one git process
+        origin_sha, local_sha = origin_head_sha, None
+        if not origin_sha:
+            try:
+                origin_sha = _resolve_ref(git_values["git_dir"], f"refs/remotes/origin/{default_branch}")
+            except KeyError:
+                try:
+                    origin_sha, local_sha = run_git_many([f"origin/{default_branch}", default_branch])
+                except Exception:
+                    origin_sha, local_sha = None, None
+
+        if origin_sha:
+            base_sha = origin_sha
+            base_ref = f"origin/{default_branch}"
+        elif local_sha:
+            # local branch named default_branch
+            base_sha = local_sha
             base_ref = default_branch
-        except Exception:
-            # fallback: ask GitHub API for branch commit SHA
-            if token:
+        else:
+            # fallback: use the SHA GitHub reported, or ask the REST API for it
+            base_ref = default_branch
+            if remote_base_sha:
+                base_sha = remote_base_sha
+            elif token:
                 try:
                     branch_data = github_api_get(f"/repos/{owner}/{repo}/branches/{default_branch}", token)
                     base_sha = branch_data.get("commit", {}).get("sha")
-                    base_ref = default_branch
                 except Exception:
                     base_sha = None
-                    base_ref = default_branch
             else:
                 base_sha = None
-                base_ref = default_branch
-
-    # 7) optionally try mapping last_author_email->github login (best-effort, requires token)
-    mapped_login = None
-    if last_author_email and token:
-        mapped_login = try_map_email_to_login(last_author_email, token)
-
-    result = {
-        "owner": owner,
-        "repo": repo,
-        "remote_url": remote_url,
-        "local_user": local_user,
-        "last_author_name": last_author_name,
-        "last_author_email": last_author_email,
-        "mapped_last_author_github_login": mapped_login,
-        "head_branch": head_branch,
-        "head_sha": head_sha,
-        "default_branch": default_branch,
-        "base_ref": base_ref if 'base_ref' in locals() else None,
-        "base_sha": base_sha,
-    }
-
-    print(json.dumps(result, indent=2))
+
+        # 7) optionally try mapping the last commit's author -> github login (best-effort, requires token)
+        mapped_login = mapped_future.result() if mapped_future is not None else None
+
+        result = {
+            "owner": owner,
+            "repo": repo,
+            "remote_url": remote_url,
+            "local_user": local_user,
+            "last_author_name": last_author_name,
+            "last_author_email": last_author_email,
+            "mapped_last_author_github_login": mapped_login,
+            "head_branch": head_branch,
+            "head_sha": head_sha,
+            "default_branch": default_branch,
+            "base_ref": base_ref if 'base_ref' in locals() else None,
+            "base_sha": base_sha,
+        }
+
+        output = _dumps(result)
+        _write_stdout(output)
+        if cache_path is not None:
+            try:
+                _write_private(cache_path, output)
+            except OSError:
+                pass  # cache is best-effort
 
 
 if __name__ == "__main__":
+    import argparse
+
     p = argparse.ArgumentParser()
     p.add_argument("--token", "-t", help="GitHub personal access token (or set GITHUB_TOKEN env var)", default=None)
+    p.add_argument("--no-cache", action="store_true", help="ignore and don't write the cached result for this commit")
     args = p.parse_args()
     token = args.token or os.environ.get("GITHUB_TOKEN")
     try:
-        main(token=token)
+        main(token=token, use_cache=not args.no_cache)
     except SystemExit as e:
         print(f"Error: {e}")
         raise SystemExit(1)